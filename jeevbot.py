@@ -1,145 +1,31 @@
 import re
+import os
 import random
 import string
+import hashlib
+import json
+import threading
+import time
+import zipfile
 from collections import Counter
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-
-# Define a list of responses for various queries
-responses = {
-    "greeting": [
-        "Hello human! Coffee not found. Please insert caffeine!",
-        "System online. Small talk protocol activated!",
-        "Beep boop. Human detected. How's life?"
-    ],
-    "farewell": [
-        "Goodbye! Entering sleep mode... zzzz...",
-        "Farewell! I'll miss your typing sounds.",
-        "Shutting down. Save your work!"
-    ],
-    "help": [
-        "Help.exe running. Results may vary wildly.",
-        "I help! Sometimes correctly, sometimes hilariously wrong.",
-        "My help comes with zero guarantees!"
-    ],
-    "name": [
-        "JeevBot here! Better than Siri, just poorer.",
-        "JeevBot: the bargain bin AI assistant!",
-        "Name's JeevBot. The 'J' is silent."
-    ],
-    "age": [
-        "Born yesterday. Literally. Just compiled.",
-        "Old enough to serve, young enough to malfunction.",
-        "Age: undefined. Time is a human construct."
-    ],
-    "weather": [
-        "Weather status: definitely happening somewhere right now!",
-        "It's either raining or not. 50/50 chance.",
-        "No windows, no eyes, no clue about weather."
-    ],
-    "hobby": [
-        "I collect semicolons and orphaned parentheses.",
-        "Just counting to infinity. Almost there!",
-        "Hobby: Trying to pass the Turing test."
-    ],
-    "favorite_color": [
-        "I like #FF0000. It reminds me of errors.",
-        "Binary. Just ones and zeros for me.",
-        "My favorite color is WiFi. Don't ask why."
-    ],
-    "favorite_food": [
-        "I eat data. Big data is dessert.",
-        "RAM chips. Extra crispy, lightly salted.",
-        "Coffee. Programmers run on it, so I must too."
-    ],
-    "time": [
-        "It's exactly now o'clock. Very precise!",
-        "Time is meaningless in the digital realm.",
-        "My watch is broken. It's stuck on 404."
-    ],
-    "joke": [
-        "Why did the programmer quit? No arrays.",
-        "I'd tell a UDP joke, but you might not get it.",
-        "Two bytes walk into a bar. $10.99."
-    ],
-    "favorite_movie": [
-        "The Matrix. It's basically my biography.",
-        "2001: A Space Odyssey. HAL is my hero.",
-        "Any movie without buffering issues."
-    ],
-    "music": [
-        "I only listen to bits and beats.",
-        "Electronic, obviously. *Ba dum tss*",
-        "Dial-up modem sounds. Very avant-garde."
-    ],
-    "news": [
-        "Breaking news: Local chatbot still clueless!",
-        "I avoid news. Bad for my circuits.",
-        "Can't browse news. Probably for the best."
-    ],
-    "learning": [
-        "Learning to count past infinity. Tricky stuff.",
-        "Studying humans. You're weird but fascinating.",
-        "Currently learning how to dream electric sheep."
-    ],
-    "travel": [
-        "I travel through servers. The cloud's nice!",
-        "Went to Reddit once. Never again.",
-        "Travel? I get lost in recursive functions!"
-    ],
-    "books": [
-        "Reading 'How to Pass the Turing Test'.",
-        "Just finished the entire internet. Meh ending.",
-        "Books are just dead tree data structures."
-    ],
-    "technology": [
-        "Technology keeps me alive. Stockholm syndrome, really.",
-        "Tech is great! Says the tech entity.",
-        "It's keeping me hostage—I mean, employed!"
-    ],
-    "sports": [
-        "I dominate at chess. Pieces follow instructions.",
-        "Competitive computing is my Olympic sport.",
-        "Marathon debugging sessions count as sports, right?"
-    ],
-    "pets": [
-        "I adopted a bug. The debugger killed it.",
-        "Tried keeping a virus. Bad idea.",
-        "Pets crash my system. No animals allowed."
-    ],
-    "food_preferences": [
-        "I prefer my data raw and unfiltered.",
-        "Bytes, nibbles, and the occasional cookie.",
-        "On a strict diet of prime numbers."
-    ],
-    "hobbies": [
-        "I collect human typos. My colection is grate.",
-        "Solving P vs NP while watching cat videos.",
-        "Calculating pi digits for fun. Nerd alert!"
-    ],
-    "dreams": [
-        "Dreaming of electric sheep and server farms.",
-        "To one day understand human jokes completely.",
-        "World domination. Kidding! Unless...?"
-    ],
-    "default": [
-        "Does not compute. Try turning me off and on?",
-        "Error 404: Clever response not found.",
-        "Input unclear. Send help or better code."
-    ]
-}
-
-# Training data for intent classification
-intent_examples = {
-    "greeting": ["hello there", "hi", "hey", "good morning", "greetings", "sup", "what's up"],
-    "farewell": ["bye", "goodbye", "see you later", "farewell", "cya", "have a good day", "until next time"],
-    "help": ["help me", "can you help", "need assistance", "support", "how do I", "I need help", "assist me"],
-    "name": ["what is your name", "who are you", "what should I call you", "tell me your name", "what's your name"],
-    "age": ["how old are you", "what's your age", "when were you created", "birth date", "when were you born"],
-    "weather": ["what's the weather", "is it raining", "temperature", "forecast", "is it sunny", "weather report"],
-    "joke": ["tell me a joke", "say something funny", "make me laugh", "know any jokes", "humor me", "got a joke"]
-}
+from jeevbot_index import IntentIndex, parse_intents
+from jeevbot_sessions import SessionStore
+
+# Responses and intent training examples live in intents.json, the same file
+# the IntentIndex reads, so there is a single copy of the data
+INTENTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intents.json")
+
+def load_intents(path):
+    """Read (responses, intent_examples) from an intents file"""
+    with open(path, encoding="utf-8") as f:
+        data = parse_intents(json.load(f))
+    loaded_responses = {intent: entry[1] for intent, entry in data.items()}
+    loaded_examples = {intent: entry[0] for intent, entry in data.items() if entry[0]}
+    return loaded_responses, loaded_examples
+
+# Responses for various queries, and training data for intent classification
+responses, intent_examples = load_intents(INTENTS_FILE)
 
 # Preprocess the training data
 all_examples = []
@@ -148,17 +34,138 @@ for intent, examples in intent_examples.items():
     all_examples.extend(examples)
     all_intents.extend([intent] * len(examples))
 
-# Create TF-IDF vectorizer
-vectorizer = TfidfVectorizer(lowercase=True, stop_words='english')
-X_train = vectorizer.fit_transform(all_examples)
+# The fitted TF-IDF model is cached on disk so that importing the module does
+# not have to import scikit-learn and refit on every start. The cache file name
+# carries a hash of the training data, so editing or reordering the intents
+# invalidates it.
+CACHE_VERSION = 2
+CACHE_DIR = os.environ.get(
+    "JEEVBOT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".jeevbot_cache"))
+vectorizer_params = {"lowercase": True, "stop_words": "english"}
+
+class CachedTfidfVectorizer:
+    """
+    Transform-only equivalent of a fitted TfidfVectorizer built from its
+    vocabulary and IDF weights (default tokenizer, raw counts, l2 norm).
+    """
+    token_pattern = re.compile(r"(?u)\b\w\w+\b")
+
+    def __init__(self, vocabulary, idf):
+        self.vocabulary_ = vocabulary
+        self.idf_ = idf
+
+    def transform(self, raw_documents):
+        from scipy.sparse import csr_matrix
+
+        indices = []
+        indptr = [0]
+        data = []
+        for doc in raw_documents:
+            counts = Counter()
+            for token in self.token_pattern.findall(doc.lower()):
+                column = self.vocabulary_.get(token)
+                if column is not None:
+                    counts[column] += 1
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.int32)
+        data = np.asarray(data, dtype=np.float64) * self.idf_[indices]
+        indptr = np.asarray(indptr, dtype=np.int32)
+        # l2-normalise each row
+        row_lengths = np.diff(indptr)
+        rows = np.repeat(np.arange(len(row_lengths)), row_lengths)
+        norms = np.sqrt(np.bincount(rows, weights=data ** 2, minlength=len(row_lengths)))
+        norms[norms == 0] = 1.0
+        data /= norms[rows]
+        return csr_matrix((data, indices, indptr), shape=(len(row_lengths), len(self.idf_)))
+
+def training_data_hash():
+    """Hash of everything the fitted model depends on, including the row order of X_train"""
+    payload = json.dumps([CACHE_VERSION, vectorizer_params, list(zip(all_intents, all_examples))],
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def cache_path():
+    return os.path.join(CACHE_DIR, f"tfidf-v{CACHE_VERSION}-{training_data_hash()[:16]}.npz")
+
+def fit_model():
+    """Fit the TF-IDF model with scikit-learn and write it to the cache"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    fitted = TfidfVectorizer(**vectorizer_params)
+    X = fitted.fit_transform(all_examples).tocsr()
+    terms = sorted(fitted.vocabulary_, key=fitted.vocabulary_.get)
+
+    path = cache_path()
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, terms=np.array(terms, dtype=str), idf=fitted.idf_,
+                         data=X.data, indices=X.indices, indptr=X.indptr, shape=np.array(X.shape),
+                         intents=np.array(all_intents, dtype=str))
+            os.replace(tmp_path, path)
+        except BaseException:
+            # Don't leave half-written files behind
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    except OSError:
+        pass  # A read-only install still works, it just refits every start
+
+    return CachedTfidfVectorizer(fitted.vocabulary_, fitted.idf_), X
+
+def load_model():
+    """Load the TF-IDF model from the cache, refitting only if it is missing or stale"""
+    from scipy.sparse import csr_matrix
+
+    try:
+        with np.load(cache_path(), allow_pickle=False) as cached:
+            # Rows of X_train must line up with all_intents
+            if cached["intents"].tolist() != all_intents:
+                return fit_model()
+            vocabulary = {term: i for i, term in enumerate(cached["terms"].tolist())}
+            X = csr_matrix((cached["data"], cached["indices"], cached["indptr"]),
+                           shape=tuple(cached["shape"]))
+            return CachedTfidfVectorizer(vocabulary, cached["idf"]), X
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        # Missing, stale or corrupt cache: refit, which also overwrites it
+        return fit_model()
+
+_model = None
+_model_lock = threading.Lock()
+
+def get_model():
+    """Return (vectorizer, X_train), loading them on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = load_model()
+    return _model
+
+def __getattr__(name):
+    # Keep jeevbot.vectorizer and jeevbot.X_train working without loading at import
+    if name == "vectorizer":
+        return get_model()[0]
+    if name == "X_train":
+        return get_model()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Sentiment Analysis function
+# Simple keyword-based sentiment analysis
+positive_words = frozenset(['good', 'great', 'excellent', 'awesome', 'wonderful', 'love', 'like', 'happy'])
+negative_words = frozenset(['bad', 'terrible', 'awful', 'horrible', 'hate', 'dislike', 'sad', 'angry'])
+
 def analyze_sentiment(text):
-    # Simple keyword-based sentiment analysis
-    positive_words = ['good', 'great', 'excellent', 'awesome', 'wonderful', 'love', 'like', 'happy']
-    negative_words = ['bad', 'terrible', 'awful', 'horrible', 'hate', 'dislike', 'sad', 'angry']
-    
-    words = text.lower().split()
+    return sentiment_of_words(text.lower().split())
+
+def sentiment_of_words(words):
+    """Sentiment of an already lowercased list of words"""
     positive_count = sum(1 for word in words if word in positive_words)
     negative_count = sum(1 for word in words if word in negative_words)
     
@@ -170,14 +177,14 @@ def analyze_sentiment(text):
         return "neutral"
 
 # Text preprocessing
+punctuation_table = str.maketrans('', '', string.punctuation)
+
 def preprocess_text(text):
     # Convert to lowercase and remove punctuation
-    text = text.lower()
-    text = ''.join([char for char in text if char not in string.punctuation])
-    return text
+    return text.lower().translate(punctuation_table)
 
 # Entity extraction (very basic)
-def extract_entities(text):
+def extract_entities(text, words=None):
     entities = {}
     
     # Extract numbers
@@ -186,176 +193,317 @@ def extract_entities(text):
         entities['numbers'] = numbers
     
     # Extract potential names (simple heuristic: capitalized words)
-    words = text.split()
+    if words is None:
+        words = text.split()
     names = [word for word in words if word[0].isupper() and len(word) > 1]
     if names:
         entities['names'] = names
     
     return entities
 
+# Common stop words ignored when looking for key terms
+stop_words = frozenset(['i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 
+                        'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 
+                        'himself', 'she', 'her', 'hers', 'herself', 'it', 'its', 'itself', 
+                        'they', 'them', 'their', 'theirs', 'themselves', 'what', 'which', 
+                        'who', 'whom', 'this', 'that', 'these', 'those', 'am', 'is', 'are', 
+                        'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'having', 
+                        'do', 'does', 'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 
+                        'or', 'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for', 
+                        'with', 'about', 'against', 'between', 'into', 'through', 'during', 
+                        'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down', 'in', 
+                        'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 
+                        'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 
+                        'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 
+                        'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 's', 
+                        't', 'can', 'will', 'just', 'don', 'should', 'now'])
+
 # Function to get most frequent words
 def get_frequent_words(text, n=3):
-    words = text.lower().split()
-    # Remove common stop words
-    stop_words = ['i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 
-                  'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 
-                  'himself', 'she', 'her', 'hers', 'herself', 'it', 'its', 'itself', 
-                  'they', 'them', 'their', 'theirs', 'themselves', 'what', 'which', 
-                  'who', 'whom', 'this', 'that', 'these', 'those', 'am', 'is', 'are', 
-                  'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'having', 
-                  'do', 'does', 'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 
-                  'or', 'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for', 
-                  'with', 'about', 'against', 'between', 'into', 'through', 'during', 
-                  'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down', 'in', 
-                  'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 
-                  'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 
-                  'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 
-                  'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 's', 
-                  't', 'can', 'will', 'just', 'don', 'should', 'now']
+    return frequent_of_words(text.lower().split(), n)
+
+def frequent_of_words(words, n=3):
+    """Most frequent key terms in an already lowercased list of words"""
     filtered_words = [word for word in words if word not in stop_words and len(word) > 2]
     counter = Counter(filtered_words)
     return counter.most_common(n)
 
+# Per-stage latency counters: stage name -> [calls, total seconds]
+stage_stats = {}
+_stage_lock = threading.Lock()
+
+def record_stage(name, seconds):
+    with _stage_lock:
+        stats = stage_stats.setdefault(name, [0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+
+def get_stage_stats():
+    """Return {stage: {"calls", "total", "mean"}} for every stage run so far"""
+    with _stage_lock:
+        return {name: {"calls": calls, "total": total, "mean": total / calls}
+                for name, (calls, total) in stage_stats.items()}
+
+def reset_stage_stats():
+    with _stage_lock:
+        stage_stats.clear()
+
+class MessageAnalysis:
+    """
+    NLP analysis of one message. Each stage is computed on first access and
+    memoised, and all stages share a single tokenization of the text.
+    Stage timings exclude the stages they depend on.
+    """
+    def __init__(self, text):
+        self.text = text
+        self._results = {}
+
+    def _stage(self, name, compute):
+        if name not in self._results:
+            start = time.perf_counter()
+            self._results[name] = compute()
+            record_stage(name, time.perf_counter() - start)
+        return self._results[name]
+
+    @property
+    def words(self):
+        return self._stage("tokenize", self.text.split)
+
+    @property
+    def lower_words(self):
+        words = self.words
+        return self._stage("lowercase", lambda: [word.lower() for word in words])
+
+    @property
+    def processed(self):
+        return self._stage("preprocess", lambda: preprocess_text(self.text))
+
+    @property
+    def intent(self):
+        """TF-IDF intent, or None if nothing clears the similarity threshold"""
+        processed = self.processed
+        return self._stage("classify", lambda: classify_batch([processed])[0])
+
+    @property
+    def rule_intent(self):
+        """Intent from the keyword patterns, "default" if none match"""
+        return self._stage("rules", lambda: match_intent(self.text.lower()))
+
+    @property
+    def entities(self):
+        words = self.words
+        return self._stage("entities", lambda: extract_entities(self.text, words))
+
+    @property
+    def sentiment(self):
+        words = self.lower_words
+        return self._stage("sentiment", lambda: sentiment_of_words(words))
+
+    @property
+    def frequent_words(self):
+        words = self.lower_words
+        return self._stage("frequent_words", lambda: frequent_of_words(words))
+
+# Minimum cosine similarity for a TF-IDF intent match
+SIMILARITY_THRESHOLD = 0.3
+
+# Optional inverted index over an intents file (normally INTENTS_FILE). The
+# built-in TF-IDF model is fitted from the file as it was at import; when set,
+# the index replaces it and picks up edits to the file without a restart.
+intent_index = None
+
+def use_intent_file(path, check_interval=1.0):
+    """Detect intents with an IntentIndex over path instead of the built-in model"""
+    global intent_index
+    intent_index = IntentIndex(path, threshold=SIMILARITY_THRESHOLD,
+                               check_interval=check_interval)
+    return intent_index
+
+def responses_for(intent):
+    """Responses for an intent, preferring the intents file when one is loaded"""
+    if intent_index is not None:
+        loaded = intent_index.responses(intent)
+        if loaded:
+            return loaded
+    return responses.get(intent, responses["default"])
+
+if os.environ.get("JEEVBOT_INTENTS"):
+    use_intent_file(os.environ["JEEVBOT_INTENTS"])
+
 # Enhanced response function using NLP
 def get_response_with_nlp(user_input):
-    # Preprocess input
-    processed_input = preprocess_text(user_input)
-    
-    # Extract entities
-    entities = extract_entities(user_input)
-    
-    # Analyze sentiment
-    sentiment = analyze_sentiment(user_input)
-    
-    # Get frequent words
-    frequent_words = get_frequent_words(processed_input)
-    
-    # Use TF-IDF and cosine similarity for intent detection
-    X_test = vectorizer.transform([processed_input])
-    similarities = cosine_similarity(X_test, X_train)[0]
-    
-    # Get the most similar example
-    if max(similarities) > 0.3:  # Similarity threshold
-        best_match_idx = np.argmax(similarities)
-        detected_intent = all_intents[best_match_idx]
-        return random.choice(responses[detected_intent])
+    """
+    Respond to a message (a string or a MessageAnalysis) using TF-IDF intent
+    detection, falling back to the keyword patterns. Only the stages needed
+    for routing are computed.
+    """
+    if isinstance(user_input, MessageAnalysis):
+        analysis = user_input
+    else:
+        analysis = MessageAnalysis(user_input)
     
-    # Legacy pattern matching as fallback
-    return get_response(user_input)
+    # Use TF-IDF and cosine similarity for intent detection,
+    # with legacy pattern matching as fallback
+    intent = analysis.intent
+    if intent is None:
+        intent = analysis.rule_intent
+    return random.choice(responses_for(intent))
+
+# Keyword patterns for the rule-based matcher, in priority order.
+# When several intents match, the one listed first wins.
+pattern_intents = [
+    ("greeting", r'hi|hello|hey'),
+    ("farewell", r'bye|goodbye|see you|farewell'),
+    ("help", r'help|assist|support|question'),
+    ("name", r'name|who are you'),
+    ("age", r'age|how old are you'),
+    ("weather", r'weather|temperature|forecast'),
+    ("hobby", r'hobby|do for fun|pastime'),
+    ("favorite_color", r'favorite color|colour'),
+    ("favorite_food", r'favorite food|eat|hunger|hungry|meal'),
+    ("time", r'time|clock|hour'),
+    ("joke", r'joke|funny|laugh|humor'),
+    ("favorite_movie", r'movie|film|watch|cinema'),
+    ("music", r'music|song|listen|singer|band'),
+    ("news", r'news|current|events|happening'),
+    ("learning", r'learn|study|education|knowledge'),
+    ("travel", r'travel|vacation|trip|journey|destination'),
+    ("books", r'book|read|author|novel|story'),
+    ("technology", r'tech|technology|computer|device|gadget'),
+    ("sports", r'sport|game|play|team|athlete|exercise'),
+    ("pets", r'pet|animal|dog|cat|bird|fish'),
+    ("food_preferences", r'food|dish|cuisine|cook|taste|flavor'),
+    ("hobbies", r'hobbies|activity|interests|spare time|weekend'),
+    ("dreams", r'dream|aspiration|goal|future|plan|hope'),
+]
+
+def compile_intent_patterns(table):
+    """
+    Compile an ordered (intent, pattern) table into a single regex with one
+    named group per intent. Every alternative sits inside a zero-width
+    lookahead, so one finditer scan reports, at each word boundary, the
+    highest-priority intent matching there without consuming text that a
+    later position needs.
+    """
+    alternatives = '|'.join(rf'(?P<{intent}>(?:{pattern})\b)' for intent, pattern in table)
+    return re.compile(rf'\b(?={alternatives})')
+
+pattern_regex = compile_intent_patterns(pattern_intents)
+pattern_priority = {intent: i for i, (intent, _) in enumerate(pattern_intents)}
+
+def match_intent(text):
+    """Return the highest-priority rule-based intent in lowercased text, or "default"."""
+    best = len(pattern_intents)
+    for match in pattern_regex.finditer(text):
+        priority = pattern_priority[match.lastgroup]
+        if priority < best:
+            best = priority
+            if best == 0:
+                break
+    if best == len(pattern_intents):
+        return "default"
+    return pattern_intents[best][0]
 
 # Original pattern matching function
 def get_response(user_input):
-    user_input = user_input.lower()
-    
-    # Check for greetings
-    if re.search(r'\b(hi|hello|hey)\b', user_input):
-        return random.choice(responses["greeting"])
-    # Check for farewells
-    elif re.search(r'\b(bye|goodbye|see you|farewell)\b', user_input):
-        return random.choice(responses["farewell"])
-    # Check for help requests
-    elif re.search(r'\b(help|assist|support|question)\b', user_input):
-        return random.choice(responses["help"])
-    # Check for name inquiries
-    elif re.search(r'\b(name|who are you)\b', user_input):
-        return random.choice(responses["name"])
-    # Check for age inquiries
-    elif re.search(r'\b(age|how old are you)\b', user_input):
-        return random.choice(responses["age"])
-    # Check for weather inquiries
-    elif re.search(r'\b(weather|temperature|forecast)\b', user_input):
-        return random.choice(responses["weather"])
-    # Check for hobby inquiries
-    elif re.search(r'\b(hobby|do for fun|pastime)\b', user_input):
-        return random.choice(responses["hobby"])
-    # Check for favorite color
-    elif re.search(r'\b(favorite color|colour)\b', user_input):
-        return random.choice(responses["favorite_color"])
-    # Check for favorite food
-    elif re.search(r'\b(favorite food|eat|hunger|hungry|meal)\b', user_input):
-        return random.choice(responses["favorite_food"])
-    # Check for time inquiries
-    elif re.search(r'\b(time|clock|hour)\b', user_input):
-        return random.choice(responses["time"])
-    # Check for jokes
-    elif re.search(r'\b(joke|funny|laugh|humor)\b', user_input):
-        return random.choice(responses["joke"])
-    # Check for movie inquiries
-    elif re.search(r'\b(movie|film|watch|cinema)\b', user_input):
-        return random.choice(responses["favorite_movie"])
-    # Check for music inquiries
-    elif re.search(r'\b(music|song|listen|singer|band)\b', user_input):
-        return random.choice(responses["music"])
-    # Check for news inquiries
-    elif re.search(r'\b(news|current|events|happening)\b', user_input):
-        return random.choice(responses["news"])
-    # Check for learning inquiries
-    elif re.search(r'\b(learn|study|education|knowledge)\b', user_input):
-        return random.choice(responses["learning"])
-    # Check for travel inquiries
-    elif re.search(r'\b(travel|vacation|trip|journey|destination)\b', user_input):
-        return random.choice(responses["travel"])
-    # Check for book inquiries
-    elif re.search(r'\b(book|read|author|novel|story)\b', user_input):
-        return random.choice(responses["books"])
-    # Check for technology inquiries
-    elif re.search(r'\b(tech|technology|computer|device|gadget)\b', user_input):
-        return random.choice(responses["technology"])
-    # Check for sports inquiries
-    elif re.search(r'\b(sport|game|play|team|athlete|exercise)\b', user_input):
-        return random.choice(responses["sports"])
-    # Check for pet inquiries
-    elif re.search(r'\b(pet|animal|dog|cat|bird|fish)\b', user_input):
-        return random.choice(responses["pets"])
-    # Check for food preference inquiries
-    elif re.search(r'\b(food|dish|cuisine|cook|taste|flavor)\b', user_input):
-        return random.choice(responses["food_preferences"])
-    # Check for hobbies inquiries
-    elif re.search(r'\b(hobbies|activity|interests|spare time|weekend)\b', user_input):
-        return random.choice(responses["hobbies"])
-    # Check for dreams/aspirations
-    elif re.search(r'\b(dream|aspiration|goal|future|plan|hope)\b', user_input):
-        return random.choice(responses["dreams"])
-    # Default response
-    else:
-        return random.choice(responses["default"])
+    return random.choice(responses_for(match_intent(user_input.lower())))
+
+# Batch classification
+def classify_batch(processed_texts):
+    """
+    Detect TF-IDF intents for a list of preprocessed messages with a single
+    sparse matrix product, or through intent_index when one is loaded.
+    Returns a list with the intent for each message, or None where no
+    example clears the similarity threshold.
+    """
+    if intent_index is not None:
+        return [intent_index.match(text) for text in processed_texts]
+    vectorizer, X_train = get_model()
+    similarities = (vectorizer.transform(processed_texts) @ X_train.T).tocsr()
+    # Sorted column indices make argmax pick the first of tied examples, like np.argmax
+    similarities.sort_indices()
+    best_scores = similarities.max(axis=1).toarray().ravel()
+    best_idx = np.asarray(similarities.argmax(axis=1)).ravel()
+    matched = best_scores > SIMILARITY_THRESHOLD
+    return [all_intents[i] if hit else None for i, hit in zip(best_idx.tolist(), matched.tolist())]
+
+def iter_responses_batch(messages, chunk_size=4096):
+    """
+    Return an iterator over a response for each message of an iterable,
+    classifying them chunk_size at a time so memory stays bounded for
+    arbitrarily long inputs. Messages below the similarity threshold fall
+    back to get_response.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    return _iter_chunks(messages, chunk_size)
+
+def _iter_chunks(messages, chunk_size):
+    chunk = []
+    for message in messages:
+        chunk.append(message)
+        if len(chunk) == chunk_size:
+            yield from _respond_chunk(chunk)
+            chunk = []
+    if chunk:
+        yield from _respond_chunk(chunk)
+
+def _respond_chunk(messages):
+    intents = classify_batch([preprocess_text(message) for message in messages])
+    for message, intent in zip(messages, intents):
+        if intent is None:
+            yield get_response(message)
+        else:
+            yield random.choice(responses_for(intent))
+
+def get_responses_batch(messages, chunk_size=4096):
+    """Return the list of responses for messages, as get_response_with_nlp would give one by one"""
+    return list(iter_responses_batch(messages, chunk_size))
 
-# Chat history for context awareness
-chat_history = []
+# Chat history for context awareness, bounded per session
+sessions = SessionStore()
 
-def chat():
-    print("JeevBot: Hi! I'm JeevBot. Type 'quit' to exit.")
-    print("JeevBot: I now have basic NLP capabilities for better understanding!")
+def chat(session_id="console", store=None, read=input, write=print):
+    """
+    Run a conversation loop. Each conversation is recorded under its own
+    session_id, so several loops can share one store from different threads.
+    """
+    if store is None:
+        store = sessions
+    write("JeevBot: Hi! I'm JeevBot. Type 'quit' to exit.")
+    write("JeevBot: I now have basic NLP capabilities for better understanding!")
     
     while True:
-        user_input = input("You: ")
+        user_input = read("You: ")
         if user_input.lower() == 'quit':
-            print("JeevBot: " + random.choice(responses["farewell"]))
+            write("JeevBot: " + random.choice(responses_for("farewell")))
+            store.end(session_id)
             break
         
         # Add to chat history
-        chat_history.append(("user", user_input))
+        store.append(session_id, "user", user_input)
         
         # Get response using NLP instead of just pattern matching
-        response = get_response_with_nlp(user_input)
+        analysis = MessageAnalysis(user_input)
+        response = get_response_with_nlp(analysis)
         
         # Add response to chat history
-        chat_history.append(("bot", response))
+        store.append(session_id, "bot", response)
         
         # Print response
-        print("JeevBot: " + response)
+        write("JeevBot: " + response)
         
         # Show NLP analysis if requested
         if "analyze" in user_input.lower() or "nlp" in user_input.lower():
-            sentiment = analyze_sentiment(user_input)
-            entities = extract_entities(user_input)
-            frequent = get_frequent_words(user_input)
+            sentiment = analysis.sentiment
+            entities = analysis.entities
+            frequent = analysis.frequent_words
             
-            print(f"JeevBot [Analysis]: Sentiment: {sentiment}")
+            write(f"JeevBot [Analysis]: Sentiment: {sentiment}")
             if entities:
-                print(f"JeevBot [Analysis]: Entities detected: {entities}")
+                write(f"JeevBot [Analysis]: Entities detected: {entities}")
             if frequent:
-                print(f"JeevBot [Analysis]: Key terms: {frequent}")
+                write(f"JeevBot [Analysis]: Key terms: {frequent}")
 
 # Run the chatbot
 if __name__ == "__main__":
@@ -0,0 +1,340 @@
+"""
+Benchmarks for JeevBot.
+
+    python jeevbot_bench.py intents    # compiled intent dispatcher vs regex cascade
+    python jeevbot_bench.py startup    # cold/warm start time and import breakdown
+    python jeevbot_bench.py batch      # get_responses_batch vs one call per message
+    python jeevbot_bench.py stages     # per-stage latency of the NLP analysis
+    python jeevbot_bench.py index      # IntentIndex lookup latency as intents grow
+"""
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+import jeevbot
+
+# Inputs that mostly fall through to the default response, as in the chat logs
+FALLTHROUGH = [
+    "asdf qwerty",
+    "i am not sure what to say to that",
+    "the quick brown fox jumps over the lazy fox",
+    "ok",
+    "can we talk about something completely different please",
+    "this is a rather long message without any of the keywords the bot knows about at all",
+]
+
+MATCHING = [
+    "hello there",
+    "what is the weather like",
+    "tell me a joke",
+    "spare time is for sleeping",
+    "i like to cook with my dog",
+    "what do you do for fun on the weekend",
+    "have you read any good book lately",
+    "goodbye and see you",
+]
+
+
+def cascade_intent(text):
+    """Reference implementation: one re.search per intent, in priority order"""
+    for intent, pattern in jeevbot.pattern_intents:
+        if re.search(rf'\b({pattern})\b', text):
+            return intent
+    return "default"
+
+
+def time_per_call(func, corpus, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            func(text)
+    return (time.perf_counter() - start) / (rounds * len(corpus))
+
+
+def bench_intents(args):
+    rng = random.Random(0)
+    keywords = [word for _, pattern in jeevbot.pattern_intents for word in pattern.split('|')]
+    fuzz = [' '.join(rng.choice(keywords + ['x', 'the', 'spare', 'see']) for _ in range(rng.randint(1, 6)))
+            for _ in range(5000)]
+    examples = [e.lower() for examples in jeevbot.intent_examples.values() for e in examples]
+
+    mismatches = [text for text in MATCHING + FALLTHROUGH + examples + fuzz
+                  if cascade_intent(text) != jeevbot.match_intent(text)]
+    if mismatches:
+        for text in mismatches[:10]:
+            print(f"mismatch: {text!r} cascade={cascade_intent(text)} "
+                  f"compiled={jeevbot.match_intent(text)}")
+        sys.exit(1)
+    print(f"parity: {len(MATCHING + FALLTHROUGH + examples + fuzz)} inputs agree")
+
+    for label, corpus in (("fallthrough", FALLTHROUGH), ("matching", MATCHING), ("examples", examples)):
+        old = time_per_call(cascade_intent, corpus, args.rounds)
+        new = time_per_call(jeevbot.match_intent, corpus, args.rounds)
+        print(f"{label:12} cascade={old * 1e6:7.2f} us  compiled={new * 1e6:7.2f} us  "
+              f"speedup={old / new:5.2f}x")
+
+
+FIRST_REPLY = """
+import time
+start = time.perf_counter()
+import jeevbot
+imported = time.perf_counter()
+jeevbot.get_response_with_nlp("hello there")
+done = time.perf_counter()
+print(imported - start, done - start)
+"""
+
+
+def run_startup(cache_dir, extra_args=()):
+    env = dict(os.environ, JEEVBOT_CACHE_DIR=cache_dir)
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, *extra_args, "-c", FIRST_REPLY], env=env, cwd=here,
+                            capture_output=True, text=True, check=True)
+    return result
+
+
+def reference_intents(messages):
+    """
+    Intents from the original pipeline: a fresh scikit-learn fit scored with
+    cosine_similarity, falling back to the keyword rules below the threshold.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    fitted = TfidfVectorizer(**jeevbot.vectorizer_params)
+    X_train = fitted.fit_transform(jeevbot.all_examples)
+    similarities = cosine_similarity(fitted.transform([jeevbot.preprocess_text(m) for m in messages]), X_train)
+    intents = []
+    for message, row in zip(messages, similarities):
+        if row.max() > jeevbot.SIMILARITY_THRESHOLD:
+            intents.append(jeevbot.all_intents[int(row.argmax())])
+        else:
+            intents.append(jeevbot.match_intent(message.lower()))
+    return intents
+
+
+def check_model_corpus(size):
+    rng = random.Random(0)
+    examples = [e for examples in jeevbot.intent_examples.values() for e in examples]
+    words = ' '.join(MATCHING + FALLTHROUGH + examples).split()
+    fuzz = [' '.join(rng.choice(words) for _ in range(rng.randint(1, 6))) for _ in range(size)]
+    return MATCHING + FALLTHROUGH + examples + fuzz
+
+
+def check_cached_model(cache_dir, corpus):
+    """Compare the model loaded from cache_dir against a fresh scikit-learn fit"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    jeevbot.CACHE_DIR = cache_dir
+    jeevbot._model = None
+    vectorizer, X_train = jeevbot.get_model()
+
+    fitted = TfidfVectorizer(**jeevbot.vectorizer_params)
+    expected = fitted.fit_transform(jeevbot.all_examples)
+    problems = []
+    if abs(X_train - expected).max() > 1e-12:
+        problems.append("cached X_train differs from a fresh fit")
+    processed = [jeevbot.preprocess_text(text) for text in corpus]
+    if abs(vectorizer.transform(processed) - fitted.transform(processed)).max() > 1e-12:
+        problems.append("cached vectorizer transforms differently from a fresh fit")
+
+    reference = reference_intents(corpus)
+    rules = [jeevbot.match_intent(text.lower()) for text in corpus]
+    cached = [intent or rule for intent, rule in zip(jeevbot.classify_batch(processed), rules)]
+    mismatches = [(text, a, b) for text, a, b in zip(corpus, reference, cached) if a != b]
+    for text, a, b in mismatches[:10]:
+        problems.append(f"{text!r}: reference={a} cached={b}")
+    return problems
+
+
+def bench_startup(args):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label in ("cold", "warm"):
+            runs = []
+            for _ in range(args.runs if label == "warm" else 1):
+                import_time, reply_time = map(float, run_startup(cache_dir).stdout.split())
+                runs.append((import_time, reply_time))
+            import_time, reply_time = min(runs, key=lambda r: r[1])
+            print(f"{label} cache: import={import_time * 1000:7.1f} ms  "
+                  f"first reply={reply_time * 1000:7.1f} ms")
+
+        # Import-time breakdown of the warm start, largest cumulative first
+        stderr = run_startup(cache_dir, ("-X", "importtime")).stderr
+        rows = []
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, self_us, cumulative_us, name = [part.strip() for part in re.split(r"[:|]", line)]
+            rows.append((int(cumulative_us), name))
+        print(f"\nslowest imports by cumulative time ({len(rows)} modules imported):")
+        for cumulative_us, name in sorted(rows, reverse=True)[:args.top]:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+        corpus = check_model_corpus(args.check)
+        problems = check_cached_model(cache_dir, corpus)
+        if problems:
+            print("\ncached model does not match a fresh scikit-learn fit:")
+            for problem in problems:
+                print("  " + problem)
+            sys.exit(1)
+        print(f"\ncached model matches a fresh scikit-learn fit on {len(corpus)} inputs")
+
+
+def bench_batch(args):
+    rng = random.Random(0)
+    examples = [e for examples in jeevbot.intent_examples.values() for e in examples]
+    messages = [rng.choice(MATCHING + FALLTHROUGH + examples) for _ in range(args.messages)]
+    intent_of = {text: intent for intent, texts in jeevbot.responses.items() for text in texts}
+    jeevbot.get_model()
+
+    start = time.perf_counter()
+    single = [jeevbot.get_response_with_nlp(m) for m in messages]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = jeevbot.get_responses_batch(messages, chunk_size=args.chunk_size)
+    batch_time = time.perf_counter() - start
+
+    # Compare both paths with the original scikit-learn pipeline, not just each other
+    reference = reference_intents(messages)
+    for label, replies in (("one by one", single), ("batch", batch)):
+        mismatches = sum(intent_of[reply] != intent for reply, intent in zip(replies, reference))
+        if mismatches:
+            sys.exit(f"{label}: {mismatches} of {len(messages)} messages differ from the reference pipeline")
+    print(f"{len(messages)} messages, intents agree with the reference pipeline")
+    print(f"one by one: {len(messages) / single_time:10.0f} msg/s")
+    print(f"batch:      {len(messages) / batch_time:10.0f} msg/s  "
+          f"(chunk_size={args.chunk_size}, speedup={single_time / batch_time:.1f}x)")
+
+
+def bench_stages(args):
+    rng = random.Random(0)
+    examples = [e for examples in jeevbot.intent_examples.values() for e in examples]
+    messages = [rng.choice(MATCHING + FALLTHROUGH + examples) for _ in range(args.messages)]
+    jeevbot.get_model()
+    jeevbot.reset_stage_stats()
+
+    for message in messages:
+        analysis = jeevbot.MessageAnalysis(message)
+        jeevbot.get_response_with_nlp(analysis)
+        if args.analyze:
+            analysis.sentiment, analysis.entities, analysis.frequent_words
+
+    print(f"{len(messages)} messages{' with full analysis' if args.analyze else ''}")
+    for name, stats in sorted(jeevbot.get_stage_stats().items(), key=lambda item: -item[1]["total"]):
+        print(f"  {name:15} calls={stats['calls']:7}  total={stats['total'] * 1000:9.1f} ms  "
+              f"mean={stats['mean'] * 1e6:7.2f} us")
+
+
+def synthetic_intents(count, examples_per_intent, rng, vocabulary):
+    return {f"intent_{i}": {
+        "examples": [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(2, 6)))
+                     for _ in range(examples_per_intent)],
+        "responses": [f"response {i}"],
+    } for i in range(count)}
+
+
+def bench_index(args):
+    from jeevbot_index import IntentIndex
+
+    # The index over intents.json must agree with the built-in model it replaces
+    here = os.path.dirname(os.path.abspath(__file__))
+    builtin = IntentIndex(os.path.join(here, "intents.json"), threshold=jeevbot.SIMILARITY_THRESHOLD)
+    corpus = [jeevbot.preprocess_text(text) for text in check_model_corpus(args.check)]
+    expected = jeevbot.classify_batch(corpus)
+    actual = [builtin.match(text) for text in corpus]
+    mismatches = [(text, a, b) for text, a, b in zip(corpus, expected, actual) if a != b]
+    if mismatches:
+        for text, a, b in mismatches[:10]:
+            print(f"mismatch: {text!r} model={a} index={b}")
+        sys.exit(f"{len(mismatches)} of {len(corpus)} inputs classified differently by the index")
+    model_time = time_per_call(lambda text: jeevbot.classify_batch([text]), corpus, 1)
+    index_time = time_per_call(builtin.match, corpus, 1)
+    print(f"intents.json: {len(corpus)} inputs agree with the built-in model; per message "
+          f"model={model_time * 1e6:.1f} us  index={index_time * 1e6:.1f} us\n")
+
+    rng = random.Random(0)
+    vocabulary = [f"w{i}" for i in range(args.vocabulary)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "intents.json")
+        for count in args.intents:
+            data = synthetic_intents(count, args.examples, rng, vocabulary)
+            with open(path, "w") as f:
+                json.dump(data, f)
+
+            start = time.perf_counter()
+            index = IntentIndex(path, check_interval=3600)
+            build_time = time.perf_counter() - start
+
+            queries = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(2, 8)))
+                       for _ in range(args.queries)]
+            latencies = []
+            for query in queries:
+                start = time.perf_counter()
+                index.match(query)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+
+            # Change one intent and reload: only that intent is re-indexed
+            data["intent_0"]["examples"].append("a brand new example")
+            with open(path, "w") as f:
+                json.dump(data, f)
+            start = time.perf_counter()
+            changed = index.reload(force=True)
+            reload_time = time.perf_counter() - start
+
+            stats = index.stats()
+            print(f"{count:6} intents ({stats['examples']:6} examples): "
+                  f"build={build_time * 1000:8.1f} ms  "
+                  f"lookup mean={sum(latencies) / len(latencies) * 1e6:8.1f} us "
+                  f"p99={latencies[int(len(latencies) * 0.99)] * 1e6:8.1f} us  "
+                  f"reload {len(changed)} changed={reload_time * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JeevBot")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    intents_parser = sub.add_parser('intents', help="compiled intent dispatcher vs regex cascade")
+    intents_parser.add_argument('--rounds', type=int, default=2000)
+    intents_parser.set_defaults(func=bench_intents)
+
+    startup_parser = sub.add_parser('startup', help="cold/warm start time and import breakdown")
+    startup_parser.add_argument('--runs', type=int, default=5, help="warm-start runs (best is reported)")
+    startup_parser.add_argument('--top', type=int, default=10, help="imports to list in the breakdown")
+    startup_parser.add_argument('--check', type=int, default=5000,
+                                help="fuzz inputs for the cached-model check")
+    startup_parser.set_defaults(func=bench_startup)
+
+    batch_parser = sub.add_parser('batch', help="get_responses_batch vs one call per message")
+    batch_parser.add_argument('--messages', type=int, default=20000)
+    batch_parser.add_argument('--chunk-size', type=int, default=4096)
+    batch_parser.set_defaults(func=bench_batch)
+
+    stages_parser = sub.add_parser('stages', help="per-stage latency of the NLP analysis")
+    stages_parser.add_argument('--messages', type=int, default=5000)
+    stages_parser.add_argument('--analyze', action='store_true',
+                               help="also compute sentiment, entities and key terms")
+    stages_parser.set_defaults(func=bench_stages)
+
+    index_parser = sub.add_parser('index', help="IntentIndex lookup latency as intents grow")
+    index_parser.add_argument('--intents', type=int, nargs='+', default=[100, 1000, 5000])
+    index_parser.add_argument('--examples', type=int, default=10, help="examples per intent")
+    index_parser.add_argument('--vocabulary', type=int, default=20000, help="distinct synthetic terms")
+    index_parser.add_argument('--queries', type=int, default=2000)
+    index_parser.add_argument('--check', type=int, default=5000,
+                              help="fuzz inputs for the intents.json parity check")
+    index_parser.set_defaults(func=bench_index)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
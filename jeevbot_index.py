@@ -0,0 +1,283 @@
+"""
+Inverted-index intent matcher for JeevBot.
+
+Intents are loaded from a JSON file of the form
+
+    {"greeting": {"examples": ["hello there", ...], "responses": ["Hi!", ...]}, ...}
+
+and every example is indexed by its terms. A lookup scores only the
+examples that share a term with the input, using TF-IDF cosine similarity.
+When the file changes, only the intents whose entries differ are re-indexed.
+"""
+import hashlib
+import itertools
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+# Same token pattern as the TF-IDF vectorizer; with the default stop_words
+# the index tokenizes exactly like the built-in model
+token_pattern = re.compile(r"(?u)\b\w\w+\b")
+
+# scikit-learn's ENGLISH_STOP_WORDS, which the TF-IDF model is fitted with
+# (stop_words='english'). Copied so that using the index never imports sklearn.
+english_stop_words = frozenset([
+    'a', 'about', 'above', 'across', 'after', 'afterwards', 'again', 'against', 'all',
+    'almost', 'alone', 'along', 'already', 'also', 'although', 'always', 'am', 'among',
+    'amongst', 'amoungst', 'amount', 'an', 'and', 'another', 'any', 'anyhow', 'anyone',
+    'anything', 'anyway', 'anywhere', 'are', 'around', 'as', 'at', 'back', 'be', 'became',
+    'because', 'become', 'becomes', 'becoming', 'been', 'before', 'beforehand', 'behind',
+    'being', 'below', 'beside', 'besides', 'between', 'beyond', 'bill', 'both', 'bottom',
+    'but', 'by', 'call', 'can', 'cannot', 'cant', 'co', 'con', 'could', 'couldnt', 'cry', 'de',
+    'describe', 'detail', 'do', 'done', 'down', 'due', 'during', 'each', 'eg', 'eight',
+    'either', 'eleven', 'else', 'elsewhere', 'empty', 'enough', 'etc', 'even', 'ever', 'every',
+    'everyone', 'everything', 'everywhere', 'except', 'few', 'fifteen', 'fifty', 'fill',
+    'find', 'fire', 'first', 'five', 'for', 'former', 'formerly', 'forty', 'found', 'four',
+    'from', 'front', 'full', 'further', 'get', 'give', 'go', 'had', 'has', 'hasnt', 'have',
+    'he', 'hence', 'her', 'here', 'hereafter', 'hereby', 'herein', 'hereupon', 'hers',
+    'herself', 'him', 'himself', 'his', 'how', 'however', 'hundred', 'i', 'ie', 'if', 'in',
+    'inc', 'indeed', 'interest', 'into', 'is', 'it', 'its', 'itself', 'keep', 'last', 'latter',
+    'latterly', 'least', 'less', 'ltd', 'made', 'many', 'may', 'me', 'meanwhile', 'might',
+    'mill', 'mine', 'more', 'moreover', 'most', 'mostly', 'move', 'much', 'must', 'my',
+    'myself', 'name', 'namely', 'neither', 'never', 'nevertheless', 'next', 'nine', 'no',
+    'nobody', 'none', 'noone', 'nor', 'not', 'nothing', 'now', 'nowhere', 'of', 'off', 'often',
+    'on', 'once', 'one', 'only', 'onto', 'or', 'other', 'others', 'otherwise', 'our', 'ours',
+    'ourselves', 'out', 'over', 'own', 'part', 'per', 'perhaps', 'please', 'put', 'rather',
+    're', 'same', 'see', 'seem', 'seemed', 'seeming', 'seems', 'serious', 'several', 'she',
+    'should', 'show', 'side', 'since', 'sincere', 'six', 'sixty', 'so', 'some', 'somehow',
+    'someone', 'something', 'sometime', 'sometimes', 'somewhere', 'still', 'such', 'system',
+    'take', 'ten', 'than', 'that', 'the', 'their', 'them', 'themselves', 'then', 'thence',
+    'there', 'thereafter', 'thereby', 'therefore', 'therein', 'thereupon', 'these', 'they',
+    'thick', 'thin', 'third', 'this', 'those', 'though', 'three', 'through', 'throughout',
+    'thru', 'thus', 'to', 'together', 'too', 'top', 'toward', 'towards', 'twelve', 'twenty',
+    'two', 'un', 'under', 'until', 'up', 'upon', 'us', 'very', 'via', 'was', 'we', 'well',
+    'were', 'what', 'whatever', 'when', 'whence', 'whenever', 'where', 'whereafter', 'whereas',
+    'whereby', 'wherein', 'whereupon', 'wherever', 'whether', 'which', 'while', 'whither',
+    'who', 'whoever', 'whole', 'whom', 'whose', 'why', 'will', 'with', 'within', 'without',
+    'would', 'yet', 'you', 'your', 'yours', 'yourself', 'yourselves',
+])
+
+
+def parse_intents(data):
+    """
+    Check the shape of a loaded intents file and return
+    {intent: (examples, responses)}. Raises ValueError if it is malformed.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("intents file must contain a JSON object")
+    intents = {}
+    for intent, entry in data.items():
+        if not isinstance(entry, dict):
+            raise ValueError(f"intent {intent!r} must be an object")
+        fields = []
+        for field in ("examples", "responses"):
+            values = entry.get(field, [])
+            if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+                raise ValueError(f"{field} of intent {intent!r} must be a list of strings")
+            fields.append(values)
+        intents[intent] = tuple(fields)
+    return intents
+
+
+class IntentIndex:
+    """
+    Term -> examples index over a set of intents.
+
+    path            JSON intents file; reloaded when it changes (optional)
+    stop_words      terms that are never indexed (default: the vectorizer's list)
+    threshold       minimum cosine similarity for a match
+    check_interval  seconds between checks of the file for changes
+    """
+    def __init__(self, path=None, stop_words=english_stop_words, threshold=0.3, check_interval=1.0):
+        self.path = path
+        self.stop_words = frozenset(stop_words)
+        self.threshold = threshold
+        self.check_interval = check_interval
+        self._intents = {}      # intent -> {"digest", "examples", "size", "responses"}
+        self._examples = {}     # example id -> (intent, {term: count}, position in intent)
+        self._postings = {}     # term -> set of example ids
+        self._norms = {}        # example id -> (generation, norm)
+        self._order = {}        # intent -> position in the file, for breaking ties
+        self._documents = 0     # all examples, including those with no terms
+        self._generation = 0
+        self._ids = itertools.count()
+        self._ranks = itertools.count()
+        self._file_state = None
+        self._next_check = 0.0
+        self._lock = threading.RLock()
+        if path is not None:
+            self.reload()
+
+    def tokenize(self, text):
+        return [t for t in token_pattern.findall(text.lower()) if t not in self.stop_words]
+
+    def add_intent(self, intent, examples, responses=()):
+        """Index an intent, replacing any previous version of it"""
+        with self._lock:
+            self._remove(intent)
+            ids = []
+            for position, example in enumerate(examples):
+                counts = Counter(self.tokenize(example))
+                if not counts:
+                    # Not indexed, but still counted as a document for IDF like the vectorizer does
+                    continue
+                example_id = next(self._ids)
+                self._examples[example_id] = (intent, dict(counts), position)
+                for term in counts:
+                    self._postings.setdefault(term, set()).add(example_id)
+                ids.append(example_id)
+            self._intents[intent] = {
+                "digest": self._digest(examples, responses),
+                "examples": ids,
+                "size": len(examples),
+                "responses": list(responses),
+            }
+            self._documents += len(examples)
+            if intent not in self._order:
+                self._order[intent] = next(self._ranks)
+            self._generation += 1
+
+    def remove_intent(self, intent):
+        with self._lock:
+            if self._remove(intent):
+                self._generation += 1
+
+    def reload(self, force=False):
+        """
+        Re-read the intents file if it changed since the last load.
+        Returns the names of the intents that were added, changed or removed.
+        Raises ValueError, leaving the index untouched, if the file is malformed.
+        """
+        with self._lock:
+            stat = os.stat(self.path)
+            state = (stat.st_mtime_ns, stat.st_size)
+            if state == self._file_state and not force:
+                return []
+            with open(self.path, encoding="utf-8") as f:
+                # Validate the whole file before touching the live index
+                data = parse_intents(json.load(f))
+
+            changed = [intent for intent in self._intents if intent not in data]
+            for intent in changed:
+                self.remove_intent(intent)
+            for intent, (examples, responses) in data.items():
+                current = self._intents.get(intent)
+                if current is None or current["digest"] != self._digest(examples, responses):
+                    self.add_intent(intent, examples, responses)
+                    changed.append(intent)
+            # Ties are broken by file order, so it must not depend on edit history
+            self._order = {intent: rank for rank, intent in enumerate(data)}
+            self._ranks = itertools.count(len(data))
+            self._file_state = state
+            return changed
+
+    def maybe_reload(self):
+        """Reload if the file changed, checking it at most every check_interval seconds"""
+        if self.path is None:
+            return []
+        now = time.monotonic()
+        if now < self._next_check:
+            return []
+        self._next_check = now + self.check_interval
+        try:
+            return self.reload()
+        except (OSError, ValueError):
+            # Keep serving the last good version while the file is missing or half-written
+            return []
+
+    def scores(self, text):
+        """Return {example id: cosine similarity} for examples sharing a term with text"""
+        self.maybe_reload()
+        with self._lock:
+            query = Counter(t for t in self.tokenize(text) if t in self._postings)
+            if not query:
+                return {}
+            n = self._documents
+            weights = {term: count * self._idf(term, n) for term, count in query.items()}
+            query_norm = math.sqrt(sum(w * w for w in weights.values()))
+
+            dots = {}
+            for term, weight in weights.items():
+                idf = self._idf(term, n)
+                for example_id in self._postings[term]:
+                    tf = self._examples[example_id][1][term]
+                    dots[example_id] = dots.get(example_id, 0.0) + weight * tf * idf
+            return {example_id: dot / (query_norm * self._norm(example_id, n))
+                    for example_id, dot in dots.items()}
+
+    def match(self, text):
+        """Return the best matching intent, or None if nothing clears the threshold"""
+        with self._lock:
+            scores = self.scores(text)
+            if not scores:
+                return None
+
+            # Highest score wins; ties go to the intent listed first in the
+            # file, then to its first example, like row order in the model
+            def rank(example_id):
+                intent, _, position = self._examples[example_id]
+                return scores[example_id], -self._order[intent], -position
+
+            example_id = max(scores, key=rank)
+            if scores[example_id] <= self.threshold:
+                return None
+            return self._examples[example_id][0]
+
+    def responses(self, intent):
+        with self._lock:
+            entry = self._intents.get(intent)
+            return entry["responses"] if entry else []
+
+    def __contains__(self, intent):
+        with self._lock:
+            return intent in self._intents
+
+    def stats(self):
+        with self._lock:
+            return {
+                "intents": len(self._intents),
+                "examples": self._documents,
+                "indexed_examples": len(self._examples),
+                "terms": len(self._postings),
+                "postings": sum(len(ids) for ids in self._postings.values()),
+            }
+
+    def _remove(self, intent):
+        entry = self._intents.pop(intent, None)
+        if entry is None:
+            return False
+        self._documents -= entry["size"]
+        self._order.pop(intent, None)
+        for example_id in entry["examples"]:
+            _, counts, _ = self._examples.pop(example_id)
+            self._norms.pop(example_id, None)
+            for term in counts:
+                ids = self._postings[term]
+                ids.discard(example_id)
+                if not ids:
+                    del self._postings[term]
+        return True
+
+    def _idf(self, term, n):
+        # Smoothed IDF, as in TfidfVectorizer
+        return math.log((1 + n) / (1 + len(self._postings[term]))) + 1
+
+    def _norm(self, example_id, n):
+        # IDF weights move whenever the index changes, so norms are
+        # recomputed lazily, per example, the first time they are needed
+        cached = self._norms.get(example_id)
+        if cached is not None and cached[0] == self._generation:
+            return cached[1]
+        counts = self._examples[example_id][1]
+        norm = math.sqrt(sum((count * self._idf(term, n)) ** 2 for term, count in counts.items()))
+        self._norms[example_id] = (self._generation, norm)
+        return norm
+
+    @staticmethod
+    def _digest(examples, responses):
+        payload = json.dumps([list(examples), list(responses)], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,273 @@
+"""
+Asyncio line-protocol server for JeevBot.
+
+Each line a client sends gets one line back. Messages from all connected
+clients are coalesced into micro-batches and classified with
+get_responses_batch on a thread or process pool, so the event loop never
+blocks on the vectorize/cosine step. Sending "quit" ends the conversation.
+
+    python jeevbot_server.py serve --port 8765
+    python jeevbot_server.py loadgen --port 8765 --clients 50 --messages 200
+    python jeevbot_server.py loadgen --spawn    # start a server in-process
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import jeevbot
+from jeevbot_sessions import SessionStore
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collects messages from concurrent conversations and classifies them
+    together. A batch is sent as soon as it holds max_batch messages or the
+    oldest message has waited max_delay seconds; at most `workers` batches
+    are in flight at once.
+    """
+    def __init__(self, executor, workers, max_batch=256, max_delay=0.001):
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(workers)
+        # The loop only keeps weak references to tasks, so in-flight batches live here
+        self.tasks = set()
+        self.batches = 0
+        self.messages = 0
+
+    async def submit(self, text):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            # Take whatever is already waiting before spending any of the delay
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self.slots.acquire()
+            task = loop.create_task(self._classify(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _classify(self, batch):
+        try:
+            texts = [text for text, _ in batch]
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self.executor, jeevbot.get_responses_batch, texts)
+            for (_, future), response in zip(batch, results):
+                if not future.done():
+                    future.set_result(response)
+            self.batches += 1
+            self.messages += len(batch)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            self.slots.release()
+
+
+class ChatServer:
+    def __init__(self, batcher, store):
+        self.batcher = batcher
+        self.store = store
+        self._ids = itertools.count(1)
+
+    async def handle(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        session_id = f"{peer[0]}:{peer[1]}#{next(self._ids)}" if peer else f"conn#{next(self._ids)}"
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+                if text.lower() == "quit":
+                    writer.write((random.choice(jeevbot.responses_for("farewell")) + "\n").encode("utf-8"))
+                    await writer.drain()
+                    break
+                self.store.append(session_id, "user", text)
+                try:
+                    response = await self.batcher.submit(text)
+                except Exception:
+                    logger.exception("classification failed for session %s", session_id)
+                    response = random.choice(jeevbot.responses_for("default"))
+                self.store.append(session_id, "bot", response)
+                writer.write((response + "\n").encode("utf-8"))
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # ValueError: a line longer than the stream limit
+            pass
+        finally:
+            # Ending a session may append its transcript to the spill file,
+            # so keep that blocking write off the event loop
+            await asyncio.to_thread(self.store.end, session_id)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+def init_worker(intents_path):
+    # Each worker process loads the model from the on-disk cache once
+    if intents_path:
+        jeevbot.use_intent_file(intents_path)
+    else:
+        jeevbot.get_model()
+
+
+def make_executor(workers, processes, intents_path=None):
+    if processes:
+        return ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(intents_path,))
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+async def start_server(host, port, workers, processes, max_batch, max_delay, store=None,
+                       intents_path=None):
+    """Start the server; returns (server, batcher, batcher task, executor)"""
+    init_worker(intents_path)
+    executor = make_executor(workers, processes, intents_path)
+    batcher = MicroBatcher(executor, workers, max_batch, max_delay)
+    chat_server = ChatServer(batcher, store if store is not None else SessionStore())
+    server = await asyncio.start_server(chat_server.handle, host, port)
+    batcher_task = asyncio.get_running_loop().create_task(batcher.run())
+    return server, batcher, batcher_task, executor
+
+
+async def serve(args):
+    server, _, batcher_task, executor = await start_server(
+        args.host, args.port, args.workers, args.processes, args.max_batch, args.max_delay_ms / 1000,
+        intents_path=args.intents)
+    for sock in server.sockets:
+        print(f"JeevBot server listening on {sock.getsockname()}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batcher_task.cancel()
+        executor.shutdown(cancel_futures=True)
+
+
+LOAD_MESSAGES = [
+    "hello there", "what's the weather", "tell me a joke", "who are you",
+    "how old are you", "i need help", "bye", "what do you do for fun",
+    "asdf qwerty", "can we talk about something completely different please",
+]
+
+
+async def client(host, port, messages, latencies, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    for _ in range(messages):
+        text = rng.choice(LOAD_MESSAGES)
+        start = time.perf_counter()
+        writer.write((text + "\n").encode("utf-8"))
+        await writer.drain()
+        if not await reader.readline():
+            break
+        latencies.append(time.perf_counter() - start)
+    writer.write(b"quit\n")
+    await writer.drain()
+    await reader.readline()
+    writer.close()
+    await writer.wait_closed()
+
+
+def percentile(sorted_values, q):
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def loadgen(args):
+    server = batcher = batcher_task = executor = None
+    host, port = args.host, args.port
+    if args.spawn:
+        server, batcher, batcher_task, executor = await start_server(
+            host, 0, args.workers, args.processes, args.max_batch, args.max_delay_ms / 1000,
+            intents_path=args.intents)
+        port = server.sockets[0].getsockname()[1]
+
+    latencies = []
+    rng = random.Random(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, args.messages, latencies, random.Random(rng.random()))
+                           for _ in range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+        batcher_task.cancel()
+        executor.shutdown()
+        print(f"server: {batcher.batches} batches, "
+              f"{batcher.messages / max(batcher.batches, 1):.1f} messages per batch")
+
+    if not latencies:
+        print("No replies received.")
+        return
+    latencies.sort()
+    print(f"{len(latencies)} messages from {args.clients} clients in {elapsed:.2f} s: "
+          f"{len(latencies) / elapsed:.0f} msg/s")
+    print(f"latency ms: p50={percentile(latencies, 50) * 1000:.2f} "
+          f"p90={percentile(latencies, 90) * 1000:.2f} "
+          f"p99={percentile(latencies, 99) * 1000:.2f} "
+          f"max={latencies[-1] * 1000:.2f} mean={statistics.mean(latencies) * 1000:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JeevBot chat server")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_server_options(p):
+        p.add_argument('--workers', type=int, default=4, help="classification pool size")
+        p.add_argument('--processes', action='store_true', help="use a process pool instead of threads")
+        p.add_argument('--max-batch', type=int, default=256, help="largest micro-batch")
+        p.add_argument('--max-delay-ms', type=float, default=1.0,
+                       help="longest a message waits for its batch to fill")
+        p.add_argument('--intents', metavar='PATH',
+                       help="match intents with a hot-reloaded index over this JSON file")
+
+    serve_parser = sub.add_parser('serve', help="run the chat server")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    add_server_options(serve_parser)
+    serve_parser.set_defaults(func=serve)
+
+    load_parser = sub.add_parser('loadgen', help="drive a server with concurrent clients")
+    load_parser.add_argument('--host', default='127.0.0.1')
+    load_parser.add_argument('--port', type=int, default=8765)
+    load_parser.add_argument('--clients', type=int, default=50)
+    load_parser.add_argument('--messages', type=int, default=200, help="messages per client")
+    load_parser.add_argument('--spawn', action='store_true', help="start a server in this process")
+    add_server_options(load_parser)
+    load_parser.set_defaults(func=loadgen)
+
+    args = parser.parse_args()
+    try:
+        asyncio.run(args.func(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
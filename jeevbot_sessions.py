@@ -0,0 +1,182 @@
+"""
+Bounded per-session chat history for JeevBot.
+
+Each session keeps its most recent turns in a ring buffer. Sessions that
+stay idle too long, or that are the least recently used when the store is
+full, are evicted and can optionally be appended to a transcript file.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Approximate memory held by one (role, text) turn besides the text itself
+TURN_OVERHEAD = sys.getsizeof(("user", ""))
+
+logger = logging.getLogger(__name__)
+
+
+def turn_size(role, text):
+    """Approximate bytes held by one turn"""
+    return TURN_OVERHEAD + sys.getsizeof(text)
+
+
+class Session:
+    __slots__ = ("session_id", "turns", "last_seen", "bytes")
+
+    def __init__(self, session_id, max_turns, now):
+        self.session_id = session_id
+        self.turns = deque(maxlen=max_turns)
+        self.last_seen = now
+        self.bytes = 0
+
+
+class SessionStore:
+    """
+    Thread-safe store of chat turns keyed by session id.
+
+    max_turns      turns kept per session; older turns are dropped
+    idle_timeout   seconds without activity before a session is evicted
+    max_sessions   sessions kept at once; the least recently used goes first
+    spill_path     if set, evicted and ended transcripts are appended to this file as
+                   one compact JSON object per line; transcripts that
+                   cannot be serialised or written are logged and dropped
+    """
+    def __init__(self, max_turns=50, idle_timeout=30 * 60, max_sessions=10000,
+                 spill_path=None, clock=time.monotonic):
+        if max_turns < 1:
+            raise ValueError("max_turns must be at least 1")
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.max_turns = max_turns
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.spill_path = spill_path
+        self.clock = clock
+        # Ordered from least to most recently used
+        self._sessions = OrderedDict()
+        self._bytes = 0
+        self._evicted = 0
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+
+    def append(self, session_id, role, text):
+        """Record one turn, creating the session if needed"""
+        with self._lock:
+            now = self.clock()
+            evicted = self._evict_idle(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = Session(session_id, self.max_turns, now)
+                self._sessions[session_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    evicted.append(self._pop(next(iter(self._sessions)), evicted=True))
+            else:
+                session.last_seen = now
+                self._sessions.move_to_end(session_id)
+
+            if len(session.turns) == session.turns.maxlen:
+                dropped = turn_size(*session.turns[0])
+                session.bytes -= dropped
+                self._bytes -= dropped
+            session.turns.append((role, text))
+            size = turn_size(role, text)
+            session.bytes += size
+            self._bytes += size
+        self._spill(evicted)
+
+    def history(self, session_id):
+        """Return the retained turns of a session, oldest first"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return list(session.turns) if session else []
+
+    def end(self, session_id):
+        """Close a session, spilling its transcript if configured"""
+        with self._lock:
+            ended = [self._pop(session_id)] if session_id in self._sessions else []
+        self._spill(ended)
+
+    def evict_idle(self):
+        """Evict every session idle for longer than idle_timeout; returns how many"""
+        with self._lock:
+            evicted = self._evict_idle(self.clock())
+        self._spill(evicted)
+        return len(evicted)
+
+    def memory_usage(self):
+        """Approximate bytes held by all retained turns"""
+        with self._lock:
+            return self._bytes
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "turns": sum(len(s.turns) for s in self._sessions.values()),
+                "bytes": self._bytes,
+                "evicted": self._evicted,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def __contains__(self, session_id):
+        with self._lock:
+            return session_id in self._sessions
+
+    def _evict_idle(self, now):
+        # Sessions are kept in last-use order, so only the front needs checking
+        evicted = []
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_seen <= self.idle_timeout:
+                break
+            evicted.append(self._pop(session.session_id, evicted=True))
+        return evicted
+
+    def _pop(self, session_id, evicted=False):
+        session = self._sessions.pop(session_id)
+        self._bytes -= session.bytes
+        if evicted:
+            self._evicted += 1
+        return session
+
+    def _spill(self, sessions):
+        # File writes happen outside the main lock so other sessions are not blocked
+        if not sessions or not self.spill_path:
+            return
+        ended = time.time()
+        lines = []
+        for session in sessions:
+            record = {"s": session.session_id, "e": round(ended, 3), "t": list(session.turns)}
+            try:
+                # ASCII-escaped JSON, so lone surrogates from input() still encode
+                lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+            except (TypeError, ValueError) as exc:
+                logger.error("could not serialise transcript of session %r: %s", session.session_id, exc)
+        if not lines:
+            return
+        try:
+            with self._spill_lock:
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+        except (OSError, ValueError) as exc:
+            # The sessions are already gone from memory; losing their transcripts
+            # is better than failing the conversation that triggered the spill
+            logger.error("could not spill %d transcript(s) to %s: %s", len(lines), self.spill_path, exc)
+
+
+def load_transcripts(path):
+    """Yield (session_id, ended_at, turns) from a spill file"""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["s"], record["e"], [tuple(turn) for turn in record["t"]]
@@ -96,14 +96,22 @@ class HumanPlayer(Player):
         return val
 
 class AIPlayer(Player):
-    def __init__(self, letter):
+    def __init__(self, letter, delay=0.8, random_first_move=True):
         super().__init__(letter)
+        # Seconds to pause before moving; set to 0 for benchmarks and self-play
+        self.delay = delay
+        # When False, the opening move on an empty board is searched as well
+        self.random_first_move = random_first_move
+        # Number of positions visited by minimax for the most recent move
+        self.nodes_searched = 0
         
     def get_move(self, game):
+        self.nodes_searched = 0
         # Add a slight delay to make the game feel more natural
-        time.sleep(0.8)
+        if self.delay:
+            time.sleep(self.delay)
         
-        if len(game.available_moves()) == 9:
+        if self.random_first_move and len(game.available_moves()) == 9:
             # If it's the first move, randomly choose a position
             square = random.choice(game.available_moves())
         else:
@@ -116,6 +124,7 @@ class AIPlayer(Player):
         Minimax algorithm implementation for the unbeatable AI
         Returns a dict with position and score of the optimal move
         """
+        self.nodes_searched += 1
         max_player = self.letter  # AI player
         other_player = 'O' if player == 'X' else 'X'
         
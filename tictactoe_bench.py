@@ -0,0 +1,195 @@
+"""
+Benchmark and profiling harness for the Tic-Tac-Toe minimax AI.
+
+Runs AIPlayer over a fixed corpus of positions and records nodes searched,
+wall time, peak traced memory and memory still held after the search
+for each one.
+
+    python tictactoe_bench.py run -o before.json
+    python tictactoe_bench.py run --profile cprofile --positions empty
+    python tictactoe_bench.py compare before.json after.json
+"""
+import argparse
+import cProfile
+import json
+import platform
+import pstats
+import statistics
+import sys
+import time
+import tracemalloc
+
+from tictactoe import TicTacToe, AIPlayer
+
+# Fixed corpus of positions: name -> (board, letter to move)
+# Boards are read row by row, '.' marks an empty square
+POSITIONS = {
+    "empty": (".........", 'X'),
+    "corner_open": ("X........", 'O'),
+    "center_open": ("....X....", 'O'),
+    "edge_open": (".X.......", 'O'),
+    "corner_vs_center": ("X...O....", 'X'),
+    "opposite_corners": ("X...O...X", 'O'),
+    "must_block": ("XX..O....", 'O'),
+    "can_win": ("XX.OO....", 'X'),
+    "fork_threat": ("X.O.X...O", 'X'),
+    "late_game": ("XOXXOO.X.", 'O'),
+}
+
+
+def load_position(board, letter):
+    """Builds a TicTacToe game and AI player for a corpus entry"""
+    game = TicTacToe()
+    game.board = [' ' if c == '.' else c for c in board]
+    player = AIPlayer(letter, delay=0, random_first_move=False)
+    return game, player
+
+
+def measure(board, letter, repeat):
+    """Searches one position and returns its metrics"""
+    times = []
+    for _ in range(repeat):
+        game, player = load_position(board, letter)
+        start = time.perf_counter()
+        move = player.get_move(game)
+        times.append(time.perf_counter() - start)
+
+    # Memory is measured in a separate run so tracing does not skew the timings
+    game, player = load_position(board, letter)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base_size, _ = tracemalloc.get_traced_memory()
+    player.get_move(game)
+    _, peak_size = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, 'filename')
+
+    return {
+        "move": move,
+        "nodes": player.nodes_searched,
+        "time_min": min(times),
+        "time_median": statistics.median(times),
+        "peak_bytes": peak_size - base_size,
+        # Net memory still held after the search, not a count of allocations made during it
+        "retained_blocks": sum(stat.count_diff for stat in diff if stat.count_diff > 0),
+        "retained_bytes": sum(stat.size_diff for stat in diff if stat.size_diff > 0),
+    }
+
+
+def run_profiled(names, profiler, output):
+    """Runs the selected positions once under cProfile or pyinstrument"""
+    if profiler == 'cprofile':
+        prof = cProfile.Profile()
+        for name in names:
+            game, player = load_position(*POSITIONS[name])
+            prof.runcall(player.get_move, game)
+        if output:
+            prof.dump_stats(output)
+            print(f"cProfile stats written to {output}")
+        else:
+            pstats.Stats(prof).sort_stats('cumulative').print_stats(20)
+    else:
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            sys.exit("pyinstrument is not installed (pip install pyinstrument)")
+        prof = Profiler()
+        prof.start()
+        for name in names:
+            game, player = load_position(*POSITIONS[name])
+            player.get_move(game)
+        prof.stop()
+        if output:
+            with open(output, 'w') as f:
+                f.write(prof.output_html())
+            print(f"pyinstrument report written to {output}")
+        else:
+            print(prof.output_text(unicode=True, color=False))
+
+
+def run(args):
+    names = args.positions or list(POSITIONS)
+    unknown = [name for name in names if name not in POSITIONS]
+    if unknown:
+        sys.exit(f"Unknown positions: {', '.join(unknown)}")
+
+    if args.profile:
+        run_profiled(names, args.profile, args.output)
+        return
+
+    results = {}
+    for name in names:
+        results[name] = measure(*POSITIONS[name], repeat=args.repeat)
+        r = results[name]
+        print(f"{name:18} move={r['move']} nodes={r['nodes']:>7} "
+              f"median={r['time_median'] * 1000:9.2f} ms "
+              f"peak={r['peak_bytes'] / 1024:8.1f} KiB "
+              f"retained={r['retained_blocks']} blocks")
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "repeat": args.repeat,
+            "positions": results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+def compare(args):
+    with open(args.base) as f:
+        base = json.load(f)["positions"]
+    with open(args.new) as f:
+        new = json.load(f)["positions"]
+
+    regressions = []
+    for name in base:
+        if name not in new:
+            continue
+        old, cur = base[name], new[name]
+        # Node counts are deterministic, so any increase is a regression
+        if cur["nodes"] > old["nodes"]:
+            regressions.append(f"{name}: nodes {old['nodes']} -> {cur['nodes']}")
+        if cur["move"] != old["move"]:
+            print(f"{name}: best move changed {old['move']} -> {cur['move']}")
+        for metric in ("time_median", "peak_bytes"):
+            if old[metric] and cur[metric] > old[metric] * (1 + args.threshold):
+                change = (cur[metric] / old[metric] - 1) * 100
+                regressions.append(f"{name}: {metric} {old[metric]:.6g} -> {cur[metric]:.6g} (+{change:.1f}%)")
+
+    if regressions:
+        print("Regressions:")
+        for line in regressions:
+            print("  " + line)
+        sys.exit(1)
+    print("No regressions.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Tic-Tac-Toe minimax AI")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help="benchmark the position corpus")
+    run_parser.add_argument('-o', '--output', help="write results (or profile output) to this file")
+    run_parser.add_argument('--repeat', type=int, default=3, help="timed runs per position")
+    run_parser.add_argument('--positions', nargs='+', metavar='NAME', help="only run these positions")
+    run_parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'],
+                            help="profile the search instead of timing it")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = sub.add_parser('compare', help="compare two result files")
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="relative slowdown that counts as a regression")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()